@@ -5,6 +5,11 @@ from datetime import datetime
 from scheduler import generate_schedule
 from export import export_to_pdf, export_to_excel
 
+try:
+    import orjson  # several times faster than stdlib json on schedule payloads
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'data/schedules'
@@ -12,6 +17,33 @@ app.config['UPLOAD_FOLDER'] = 'data/schedules'
 # Ensure data directory exists
 os.makedirs('data/schedules', exist_ok=True)
 
+# Schedules are written once and then re-read by every view/export
+# request; memoize the parsed JSON keyed by file mtime so repeat
+# requests skip the disk read and parse
+_schedule_cache = {}
+
+def load_schedule(schedule_id):
+    """Load a generated schedule by id, or None if it doesn't exist"""
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'schedule_{schedule_id}.json')
+
+    if not os.path.exists(filepath):
+        return None
+
+    mtime = os.path.getmtime(filepath)
+    cached = _schedule_cache.get(filepath)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            schedule_data = orjson.loads(f.read())
+    else:
+        with open(filepath, 'r') as f:
+            schedule_data = json.load(f)
+
+    _schedule_cache[filepath] = (mtime, schedule_data)
+    return schedule_data
+
 @app.route('/')
 def index():
     """Landing page with navigation"""
@@ -76,27 +108,21 @@ def input_page():
 @app.route('/schedule/<schedule_id>')
 def view_schedule(schedule_id):
     """View generated schedule"""
-    schedule_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'schedule_{schedule_id}.json')
-    
-    if not os.path.exists(schedule_filepath):
+    schedule_data = load_schedule(schedule_id)
+
+    if schedule_data is None:
         return "Schedule not found", 404
     
-    with open(schedule_filepath, 'r') as f:
-        schedule_data = json.load(f)
-    
     return render_template('schedule.html', schedule=schedule_data, schedule_id=schedule_id)
 
 @app.route('/schedule/<schedule_id>/<program>')
 def view_program_schedule(schedule_id, program):
     """View schedule filtered by program"""
-    schedule_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'schedule_{schedule_id}.json')
-    
-    if not os.path.exists(schedule_filepath):
+    schedule_data = load_schedule(schedule_id)
+
+    if schedule_data is None:
         return "Schedule not found", 404
     
-    with open(schedule_filepath, 'r') as f:
-        schedule_data = json.load(f)
-    
     # Filter schedule for specific program
     filtered_schedule = filter_schedule_by_program(schedule_data, program)
     
@@ -105,14 +131,11 @@ def view_program_schedule(schedule_id, program):
 @app.route('/export/pdf/<schedule_id>/<program>')
 def export_pdf(schedule_id, program):
     """Export schedule as PDF"""
-    schedule_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'schedule_{schedule_id}.json')
-    
-    if not os.path.exists(schedule_filepath):
+    schedule_data = load_schedule(schedule_id)
+
+    if schedule_data is None:
         return "Schedule not found", 404
     
-    with open(schedule_filepath, 'r') as f:
-        schedule_data = json.load(f)
-    
     # Filter for program
     filtered_schedule = filter_schedule_by_program(schedule_data, program)
     
@@ -124,14 +147,11 @@ def export_pdf(schedule_id, program):
 @app.route('/export/excel/<schedule_id>/<program>')
 def export_excel(schedule_id, program):
     """Export schedule as Excel"""
-    schedule_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'schedule_{schedule_id}.json')
-    
-    if not os.path.exists(schedule_filepath):
+    schedule_data = load_schedule(schedule_id)
+
+    if schedule_data is None:
         return "Schedule not found", 404
     
-    with open(schedule_filepath, 'r') as f:
-        schedule_data = json.load(f)
-    
     # Filter for program
     filtered_schedule = filter_schedule_by_program(schedule_data, program)
     
@@ -153,7 +173,9 @@ def filter_schedule_by_program(schedule_data, program):
         'schedule': {}
     }
     
-    program_courses = schedule_data['programs'].get(program, {}).get('courses', [])
+    # Set lookup: the per-session membership test below runs for every
+    # session in the schedule
+    program_courses = set(schedule_data['programs'].get(program, {}).get('courses', []))
     
     for week, week_data in schedule_data.get('schedule', {}).items():
         filtered['schedule'][week] = {}
@@ -11,10 +11,57 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 import os
 
+try:
+    import lxml  # noqa: F401 - enables openpyxl's fast (lxml) serializer
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+    print("Warning: lxml not installed, Excel export uses the slower stdlib xml serializer")
+
 
 DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
 TIMESLOTS = ['08:30', '11:00', '13:30', '16:00']
 
+# PDF header row, shared across weeks (reportlab accepts tuples)
+_HEADER_ROW = ('Time', *DAYS)
+
+# Excel column letters for the Time column plus the five day columns
+_COL_LETTERS = ['A', 'B', 'C', 'D', 'E', 'F']
+
+# Excel styles, created once so openpyxl interns a single style table
+# entry per style instead of one per cell
+HEADER_FILL = PatternFill(start_color='003366', end_color='003366', fill_type='solid')
+HEADER_FONT = Font(color='FFFFFF', bold=True)
+TIME_FILL = PatternFill(start_color='f8f9fa', end_color='f8f9fa', fill_type='solid')
+TIME_FONT = Font(bold=True)
+THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+CENTER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+CELL_ALIGNMENT = Alignment(horizontal='left', vertical='top', wrap_text=True)
+
+LECTURE_FILL = PatternFill(start_color='e8f5e9', end_color='e8f5e9', fill_type='solid')
+TUTORIAL_FILL = PatternFill(start_color='fff3e0', end_color='fff3e0', fill_type='solid')
+LAB_FILL = PatternFill(start_color='f3e5f5', end_color='f3e5f5', fill_type='solid')
+
+
+def _session_grid(week_data):
+    """Flatten one week's nested day->timeslot dicts into a dense
+    timeslot x day grid (None = empty slot), so the exporters only
+    pay dict lookups for slots that actually hold sessions."""
+    grid = [[None] * len(DAYS) for _ in TIMESLOTS]
+    for day, day_data in week_data.items():
+        if day not in DAYS:
+            continue
+        day_idx = DAYS.index(day)
+        for timeslot, sessions in day_data.items():
+            if sessions and timeslot in TIMESLOTS:
+                grid[TIMESLOTS.index(timeslot)][day_idx] = sessions
+    return grid
+
 
 def export_to_pdf(schedule_data, program, schedule_id):
     """Export schedule to PDF format matching original layout"""
@@ -51,32 +98,28 @@ def export_to_pdf(schedule_data, program, schedule_id):
         elements.append(week_title)
         elements.append(Spacer(1, 0.1*inch))
         
-        # Build table data
-        table_data = []
-        
-        # Header row
-        header_row = ['Time'] + DAYS
-        table_data.append(header_row)
-        
+        # Build table data, reusing the shared header row
+        table_data = [_HEADER_ROW]
+
         # Data rows
-        for timeslot in TIMESLOTS:
+        grid = _session_grid(week_data)
+        for time_idx, timeslot in enumerate(TIMESLOTS):
             end_time = '10:30' if timeslot == '08:30' else ('13:00' if timeslot == '11:00' else ('15:30' if timeslot == '13:30' else '18:00'))
             row = [f"{timeslot} – {end_time}"]
-            
-            for day in DAYS:
-                sessions = week_data.get(day, {}).get(timeslot, [])
+
+            for day_idx in range(len(DAYS)):
+                sessions = grid[time_idx][day_idx]
                 if sessions:
                     cell_content = []
                     for session in sessions:
-                        course_abbr = session['course_name'].split('(')[1].replace(')', '') if '(' in session['course_name'] else session['course_name'][:10]
                         session_type = session['type'][0].upper() if session['type'] else ''
                         cell_text = f"{session['course']} ({session_type})\n{session['room']}"
                         cell_content.append(cell_text)
                     row.append('\n---\n'.join(cell_content))
                 else:
                     row.append('—')
-            
-            table_data.append(row)
+
+            table_data.append(tuple(row))
         
         # Create table
         table = Table(table_data, colWidths=[1.2*inch] + [1.5*inch]*5)
@@ -124,27 +167,11 @@ def export_to_excel(schedule_data, program, schedule_id):
     filepath = os.path.join('data', 'schedules', filename)
     
     wb = Workbook()
-    
+
     # Remove default sheet
     if 'Sheet' in wb.sheetnames:
         wb.remove(wb['Sheet'])
-    
-    # Styles
-    header_fill = PatternFill(start_color='003366', end_color='003366', fill_type='solid')
-    header_font = Font(color='FFFFFF', bold=True)
-    time_fill = PatternFill(start_color='f8f9fa', end_color='f8f9fa', fill_type='solid')
-    time_font = Font(bold=True)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    lecture_fill = PatternFill(start_color='e8f5e9', end_color='e8f5e9', fill_type='solid')
-    tutorial_fill = PatternFill(start_color='fff3e0', end_color='fff3e0', fill_type='solid')
-    lab_fill = PatternFill(start_color='f3e5f5', end_color='f3e5f5', fill_type='solid')
-    
+
     # Create sheet for each week
     for week_key in sorted(schedule_data.get('schedule', {}).keys()):
         week_data = schedule_data['schedule'][week_key]
@@ -152,10 +179,13 @@ def export_to_excel(schedule_data, program, schedule_id):
         
         ws = wb.create_sheet(title=f"Week {week_num}")
         
-        # Set column widths
-        ws.column_dimensions['A'].width = 18
-        for col in ['B', 'C', 'D', 'E', 'F']:
-            ws.column_dimensions[col].width = 25
+        # Set dimensions in one pass: default row height covers the data
+        # rows, and only the header row gets its own RowDimension back
+        # at the standard height
+        ws.sheet_format.defaultRowHeight = 60
+        ws.row_dimensions[1].height = 15
+        for col in _COL_LETTERS:
+            ws.column_dimensions[col].width = 18 if col == 'A' else 25
         
         # Header
         ws['A1'] = 'Time'
@@ -165,26 +195,27 @@ def export_to_excel(schedule_data, program, schedule_id):
         # Style header
         for col in range(1, 7):
             cell = ws.cell(row=1, column=col)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
+            cell.fill = HEADER_FILL
+            cell.font = HEADER_FONT
+            cell.alignment = CENTER_ALIGNMENT
+            cell.border = THIN_BORDER
         
         # Data rows
+        grid = _session_grid(week_data)
         for row_idx, timeslot in enumerate(TIMESLOTS, start=2):
             end_time = '10:30' if timeslot == '08:30' else ('13:00' if timeslot == '11:00' else ('15:30' if timeslot == '13:30' else '18:00'))
             
             # Time column
             time_cell = ws.cell(row=row_idx, column=1)
             time_cell.value = f"{timeslot} – {end_time}"
-            time_cell.fill = time_fill
-            time_cell.font = time_font
-            time_cell.alignment = Alignment(horizontal='center', vertical='center')
-            time_cell.border = border
+            time_cell.fill = TIME_FILL
+            time_cell.font = TIME_FONT
+            time_cell.alignment = CENTER_ALIGNMENT
+            time_cell.border = THIN_BORDER
             
             # Day columns
             for col_idx, day in enumerate(DAYS, start=2):
-                sessions = week_data.get(day, {}).get(timeslot, [])
+                sessions = grid[row_idx - 2][col_idx - 2]
                 cell = ws.cell(row=row_idx, column=col_idx)
                 
                 if sessions:
@@ -192,33 +223,28 @@ def export_to_excel(schedule_data, program, schedule_id):
                     cell_fill = None
                     
                     for session in sessions:
-                        course_abbr = session['course_name'].split('(')[1].replace(')', '') if '(' in session['course_name'] else session['course_name'][:10]
                         session_type = session['type'].capitalize()
                         line = f"{session['course']} ({session_type})\n{session['room']}"
                         cell_lines.append(line)
                         
                         # Set fill color based on session type
                         if session['type'] == 'lecture':
-                            cell_fill = lecture_fill
+                            cell_fill = LECTURE_FILL
                         elif session['type'] == 'tutorial':
-                            cell_fill = tutorial_fill
+                            cell_fill = TUTORIAL_FILL
                         elif session['type'] == 'lab':
-                            cell_fill = lab_fill
+                            cell_fill = LAB_FILL
                     
                     cell.value = '\n---\n'.join(cell_lines)
                     if cell_fill:
                         cell.fill = cell_fill
                 else:
                     cell.value = '—'
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
+                    cell.alignment = CENTER_ALIGNMENT
                 
-                cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-                cell.border = border
+                cell.alignment = CELL_ALIGNMENT
+                cell.border = THIN_BORDER
         
-        # Set row heights
-        for row in range(2, 6):
-            ws.row_dimensions[row].height = 60
-    
     # Save
     wb.save(filepath)
     
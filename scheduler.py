@@ -3,11 +3,25 @@ FSP Course Scheduler - Main Scheduling Engine
 Simplified constraint-based scheduler for hackathon MVP
 """
 
+import hashlib
+import os
 import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Tuple
 import copy
 import json
 
+try:
+    from ortools.sat.python import cp_model
+except ImportError:
+    cp_model = None
+
+try:
+    import orjson  # several times faster than stdlib json on schedule payloads
+except ImportError:
+    orjson = None
+
 # Constants
 DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
 TIMESLOTS = ['08:30', '11:00', '13:30', '16:00']
@@ -28,25 +42,116 @@ ROOMS = {
     'B0.003': {'capacity': 75, 'floor': 0},
 }
 
+# Bit encodings for the availability bitsets: every (week, day, time)
+# triple maps to slot_id = (week * 5 + day) * 4 + time, and each
+# teacher/program/room carries one busy bit per slot
+SLOTS_PER_WEEK = len(DAYS) * len(TIMESLOTS)
+NUM_SLOTS = WEEKS * SLOTS_PER_WEEK
+FULL_SLOT_MASK = (1 << NUM_SLOTS) - 1
+ROOM_NAMES = list(ROOMS)
+LARGE_ROOM_NAMES = [name for name in ROOM_NAMES if ROOMS[name]['capacity'] >= 150]
+ROOM_CAPACITY = {name: info['capacity'] for name, info in ROOMS.items()}
+WEEK_KEYS = [f'week_{week + 1}' for week in range(WEEKS)]
+
+# On-disk cache for generated schedules, keyed by input hash
+CACHE_DIR = os.path.join('data', 'cache')
+
+# Dedicated RNG instance so the scheduler neither shares nor disturbs
+# the global random state; worker processes reseed it per pid
+_rng = random.Random()
 
-def generate_schedule(input_data: Dict[str, Any]) -> Dict[str, Any]:
+
+def generate_schedule(input_data: Dict[str, Any], use_cache: bool = True,
+                      solver: str = 'greedy') -> Dict[str, Any]:
     """
     Main function to generate schedule using greedy constraint-based approach
+
+    Results are cached on disk keyed by a hash of the canonical input
+    JSON, so repeated calls with the same input skip the solver.
+
+    solver='cpsat' runs the in-process CP-SAT formulation instead of
+    the greedy pass (requires ortools).
     """
     print("Starting schedule generation...")
-    
-    # Use simplified greedy approach for MVP
-    print("Generating schedule with constraint-based greedy algorithm...")
-    schedule = solve_with_greedy_approach(input_data)
-    
+
+    cache_path = None
+    if use_cache:
+        key = hashlib.sha256(json.dumps(input_data, sort_keys=True).encode()).hexdigest()
+        cache_path = os.path.join(CACHE_DIR, f'{solver}_{key}.json')
+        if os.path.exists(cache_path):
+            print("Returning cached schedule...")
+            if orjson is not None:
+                with open(cache_path, 'rb') as f:
+                    return orjson.loads(f.read())
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+
+    if solver == 'cpsat':
+        if cp_model is None:
+            raise Exception("ortools is not installed, cpsat solver unavailable")
+        print("Generating schedule with CP-SAT solver...")
+        schedule = solve_hard_constraints_cpsat_OLD(input_data)
+    else:
+        # Use simplified greedy approach for MVP
+        print("Generating schedule with constraint-based greedy algorithm...")
+        schedule = solve_with_greedy_approach(input_data)
+
+        # Validate the cheap pass before accepting it: the greedy
+        # search drops sessions it cannot place, so fall back to the
+        # exact CP-SAT solver only when a shortfall actually occurs
+        if schedule is not None and cp_model is not None:
+            placed = count_placed_sessions(schedule)
+            if placed < count_requested_sessions(input_data):
+                print("Greedy schedule incomplete, retrying with CP-SAT solver...")
+                exact = solve_hard_constraints_cpsat_OLD(
+                    input_data, greedy_schedule=schedule)
+                # Keep whichever schedule places more, so a weaker
+                # exact result never replaces (and caches over) a
+                # near-complete greedy one
+                if exact is not None and count_placed_sessions(exact) > placed:
+                    schedule = exact
+
     if schedule is None:
         raise Exception("No valid solution found")
-    
+
     print("Schedule generation complete!")
-    
+
+    if cache_path:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        if orjson is not None:
+            with open(cache_path, 'wb') as f:
+                f.write(orjson.dumps(schedule))
+        else:
+            with open(cache_path, 'w') as f:
+                json.dump(schedule, f)
+
     return schedule
 
 
+def count_requested_sessions(input_data: Dict[str, Any]) -> int:
+    """Number of sessions the greedy solver is asked to place: all
+    lectures plus one copy of each tutorial/lab per practical group"""
+    course_size = {}
+    for program_data in input_data['programs'].values():
+        for course_code in program_data['courses']:
+            course_size.setdefault(course_code, program_data.get('size', 0))
+
+    total = 0
+    for course in input_data['courses']:
+        num_groups = 4 if course_size.get(course['code'], 0) > 75 else 1
+        total += course.get('lectures', 0)
+        total += (course.get('tutorials', 0) + course.get('labs', 0)) * num_groups
+    return total
+
+
+def count_placed_sessions(schedule: Dict[str, Any]) -> int:
+    """Number of sessions actually present in a nested schedule"""
+    return sum(len(sessions)
+               for week_data in schedule['schedule'].values()
+               for day_data in week_data.values()
+               for sessions in day_data.values())
+
+
 def solve_with_greedy_approach(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Simplified greedy scheduler that satisfies hard constraints
@@ -55,64 +160,101 @@ def solve_with_greedy_approach(input_data: Dict[str, Any]) -> Dict[str, Any]:
     teachers = input_data['teachers']
     programs = input_data['programs']
     
-    # Initialize schedule structure
-    schedule = {
-        'metadata': input_data.get('metadata', {}),
-        'programs': programs,
-        'schedule': {}
-    }
-    
-    for week in range(WEEKS):
-        schedule['schedule'][f'week_{week+1}'] = {}
-        for day in DAYS:
-            schedule['schedule'][f'week_{week+1}'][day] = {}
-            for timeslot in TIMESLOTS:
-                schedule['schedule'][f'week_{week+1}'][day][timeslot] = []
-    
-    # Track what's been scheduled
-    scheduled_sessions = []
-    
+    # Sessions are collected in a flat list indexed by slot_id; the
+    # nested week/day/timeslot dicts are only materialized once at the
+    # end for the JSON output
+    sessions_by_slot = [[] for _ in range(NUM_SLOTS)]
+
+
     # Create mapping of courses to programs
-    course_to_programs = {}
+    course_to_programs = defaultdict(list)
     for program_name, program_data in programs.items():
         for course_code in program_data['courses']:
-            if course_code not in course_to_programs:
-                course_to_programs[course_code] = []
             course_to_programs[course_code].append(program_name)
-    
-    # Track usage
-    room_usage = {}  # (week, day, time) -> room
-    teacher_usage = {}  # (week, day, time) -> teacher
-    program_usage = {}  # (program, week, day, time) -> bool
+
+    # Precompute course -> teacher (first match) and per-program metadata
+    # once, so the course loop does O(1) lookups instead of linear scans
+    course_to_teacher = {}
+    for t_name, t_data in teachers.items():
+        for course_code in t_data['courses']:
+            if course_code not in course_to_teacher:
+                course_to_teacher[course_code] = t_name
+
+    program_info = {}  # program -> (size, needs_large_room)
+    for program_name, program_data in programs.items():
+        size = program_data.get('size', 0)
+        program_info[program_name] = (size, program_name.endswith('_Y1') and size >= 150)
+
+    # course -> (program, size, needs_large_room), resolved once so the
+    # course loop does a single lookup instead of chaining two
+    program_lookup = {}
+    for course_code, program_names in course_to_programs.items():
+        first = program_names[0]
+        size, needs_large = program_info[first]
+        program_lookup[course_code] = (first, size, needs_large)
+
+    # Schedule the most constrained courses first (CSP variable-ordering
+    # heuristic): courses needing the scarce large room, then courses
+    # with more sessions to place, then courses of busier teachers.
+    # Late placements then face fewer failed slot searches
+    teacher_load = {t_name: len(t_data['courses']) for t_name, t_data in teachers.items()}
+
+    def course_constrainedness(course):
+        _, _, needs_large = program_lookup.get(course['code'], (None, 0, False))
+        total_sessions = (course.get('lectures', 0) + course.get('tutorials', 0)
+                          + course.get('labs', 0))
+        teacher = course_to_teacher.get(course['code'])
+        return (-int(needs_large), -total_sessions, -teacher_load.get(teacher, 0))
+
+    courses = sorted(courses, key=course_constrainedness)
+
+    # Track usage as integer bitsets: one bit per slot_id (or per room),
+    # so availability probes are single bit tests instead of tuple hashes
+    room_busy = defaultdict(int)     # room -> bitmask over slot ids
+    teacher_busy = defaultdict(int)  # teacher -> bitmask over slot ids
+    program_busy = defaultdict(int)  # program -> bitmask over slot ids
     
     # Schedule all courses
     for course in courses:
         course_code = course['code']
         course_name = course['name']
         
-        # Find teacher for this course
-        teacher = None
-        for t_name, t_data in teachers.items():
-            if course_code in t_data['courses']:
-                teacher = t_name
-                break
-        
-        # Find program
-        program = course_to_programs.get(course_code, [None])[0]
-        
-        # Determine room constraints
-        year_one = program and program.endswith('_Y1')
-        needs_large_room = year_one and programs.get(program, {}).get('size', 0) >= 150
+        # Find teacher and program metadata for this course
+        teacher = course_to_teacher.get(course_code)
+        program, program_size, needs_large_room = program_lookup.get(
+            course_code, (None, 0, False))
+
+        # Allowed rooms are fixed per course, so resolve them here once
+        # instead of re-branching on every find_available_slot probe.
+        # Practicals only need to fit one group, so rooms below the
+        # group size are filtered out up front rather than rediscovered
+        # as infeasible during every slot search
+        lecture_rooms = LARGE_ROOM_NAMES if needs_large_room else ROOM_NAMES
+        group_size = program_size // 4 if program_size > 75 else program_size
+        practical_rooms = [name for name in ROOM_NAMES
+                           if ROOM_CAPACITY[name] >= group_size]
+        if not practical_rooms:
+            practical_rooms = ROOM_NAMES
+
+        # Shared session fields for this course; per-placement calls only
+        # add the varying type and room
+        base_info = {
+            'course': course_code,
+            'course_name': course_name,
+            'teacher': teacher,
+            'program': program
+        }
         
         # Schedule lectures first (theory before practical)
         for lec_num in range(course.get('lectures', 0)):
             slot = find_available_slot(
                 week_range=range(WEEKS),
-                room_usage=room_usage,
-                teacher_usage=teacher_usage,
-                program_usage=program_usage,
+                room_busy=room_busy,
+                teacher_busy=teacher_busy,
+                program_busy=program_busy,
                 teacher=teacher,
                 program=program,
+                allowed_rooms=lecture_rooms,
                 needs_large_room=needs_large_room,
                 session_type='lecture'
             )
@@ -120,24 +262,26 @@ def solve_with_greedy_approach(input_data: Dict[str, Any]) -> Dict[str, Any]:
             if slot:
                 week, day_idx, time_idx, room = slot
                 add_session_to_schedule(
-                    schedule, week, day_idx, time_idx, room,
-                    course_code, course_name, 'lecture', teacher, program,
-                    room_usage, teacher_usage, program_usage
+                    sessions_by_slot, week, day_idx, time_idx, room,
+                    base_info, 'lecture',
+                    room_busy, teacher_busy, program_busy
                 )
         
+        # Practical group count is a property of the program, not of the
+        # individual tutorial/lab, so compute it once per course
+        num_groups = 4 if program and program_size > 75 else 1
+
         # Schedule tutorials
         for tut_num in range(course.get('tutorials', 0)):
-            # Split into groups for tutorials
-            num_groups = 4 if program and programs[program]['size'] > 75 else 1
-            
             for group in range(num_groups):
                 slot = find_available_slot(
                     week_range=range(WEEKS),
-                    room_usage=room_usage,
-                    teacher_usage=teacher_usage,
-                    program_usage=program_usage,
+                    room_busy=room_busy,
+                    teacher_busy=teacher_busy,
+                    program_busy=program_busy,
                     teacher=teacher,
                     program=program,
+                    allowed_rooms=practical_rooms,
                     needs_large_room=False,
                     session_type='tutorial'
                 )
@@ -145,24 +289,22 @@ def solve_with_greedy_approach(input_data: Dict[str, Any]) -> Dict[str, Any]:
                 if slot:
                     week, day_idx, time_idx, room = slot
                     add_session_to_schedule(
-                        schedule, week, day_idx, time_idx, room,
-                        course_code, course_name, 'tutorial', teacher, program,
-                        room_usage, teacher_usage, program_usage
+                        sessions_by_slot, week, day_idx, time_idx, room,
+                        base_info, 'tutorial',
+                        room_busy, teacher_busy, program_busy
                     )
         
         # Schedule labs
         for lab_num in range(course.get('labs', 0)):
-            # Split into groups for labs
-            num_groups = 4 if program and programs[program]['size'] > 75 else 1
-            
             for group in range(num_groups):
                 slot = find_available_slot(
                     week_range=range(WEEKS),
-                    room_usage=room_usage,
-                    teacher_usage=teacher_usage,
-                    program_usage=program_usage,
+                    room_busy=room_busy,
+                    teacher_busy=teacher_busy,
+                    program_busy=program_busy,
                     teacher=teacher,
                     program=program,
+                    allowed_rooms=practical_rooms,
                     needs_large_room=False,
                     session_type='lab'
                 )
@@ -170,265 +312,276 @@ def solve_with_greedy_approach(input_data: Dict[str, Any]) -> Dict[str, Any]:
                 if slot:
                     week, day_idx, time_idx, room = slot
                     add_session_to_schedule(
-                        schedule, week, day_idx, time_idx, room,
-                        course_code, course_name, 'lab', teacher, program,
-                        room_usage, teacher_usage, program_usage
+                        sessions_by_slot, week, day_idx, time_idx, room,
+                        base_info, 'lab',
+                        room_busy, teacher_busy, program_busy
                     )
-    
-    return schedule
+
+    return {
+        'metadata': input_data.get('metadata', {}),
+        'programs': programs,
+        'schedule': to_nested(sessions_by_slot)
+    }
 
 
-def find_available_slot(week_range, room_usage, teacher_usage, program_usage, 
-                       teacher, program, needs_large_room, session_type):
+def find_available_slot(week_range, room_busy, teacher_busy, program_busy,
+                       teacher, program, allowed_rooms, needs_large_room, session_type):
     """Find first available slot that satisfies constraints"""
-    
-    # Randomize order to get variation
-    weeks = list(week_range)
-    random.shuffle(weeks)
-    
-    for week in weeks:
-        for day_idx in range(len(DAYS)):
-            for time_idx in range(len(TIMESLOTS)):
-                # Check if teacher is available
-                if teacher and (week, day_idx, time_idx) in teacher_usage:
-                    if teacher_usage[(week, day_idx, time_idx)] == teacher:
-                        continue
-                
-                # Check if program has conflict
-                if program and (program, week, day_idx, time_idx) in program_usage:
-                    continue
-                
-                # Find available room
-                available_rooms = []
-                for room_name, room_info in ROOMS.items():
-                    if needs_large_room and room_info['capacity'] < 150:
-                        continue
-                    
-                    if (week, day_idx, time_idx, room_name) not in room_usage:
-                        available_rooms.append(room_name)
-                
-                if available_rooms:
-                    # Prefer MSP for large lectures
-                    if needs_large_room and 'MSP' in available_rooms:
-                        return (week, day_idx, time_idx, 'MSP')
-                    else:
-                        return (week, day_idx, time_idx, available_rooms[0])
-    
+
+    # Compute the candidate set for the whole 140-slot domain in one
+    # pass of wide bitwise ops: a slot is a candidate when teacher and
+    # program are free and at least one allowed room is free
+    all_rooms_full = FULL_SLOT_MASK
+    for room_name in allowed_rooms:
+        all_rooms_full &= room_busy[room_name]
+
+    teacher_mask = teacher_busy[teacher] if teacher else 0
+    program_mask = program_busy[program] if program else 0
+    candidates = ~(teacher_mask | program_mask | all_rooms_full) & FULL_SLOT_MASK
+    if not candidates:
+        return None
+
+    # Randomize order with one flat permutation over every slot, so
+    # variation covers days and times too instead of only weeks (the
+    # old week shuffle always filled Monday/08:30 first within a week)
+    slot_order = [week * SLOTS_PER_WEEK + offset
+                  for week in week_range for offset in range(SLOTS_PER_WEEK)]
+    _rng.shuffle(slot_order)
+
+    for slot_id in slot_order:
+        slot_bit = 1 << slot_id
+        if not candidates & slot_bit:
+            continue
+
+        week, offset = divmod(slot_id, SLOTS_PER_WEEK)
+        day_idx, time_idx = divmod(offset, len(TIMESLOTS))
+
+        # Prefer MSP for large lectures
+        if needs_large_room and not room_busy['MSP'] & slot_bit:
+            return (week, day_idx, time_idx, 'MSP')
+        for room_name in allowed_rooms:
+            if not room_busy[room_name] & slot_bit:
+                return (week, day_idx, time_idx, room_name)
+
     return None
 
 
-def add_session_to_schedule(schedule, week, day_idx, time_idx, room, 
-                            course_code, course_name, session_type, teacher, program,
-                            room_usage, teacher_usage, program_usage):
+def add_session_to_schedule(sessions_by_slot, week, day_idx, time_idx, room,
+                            base_info, session_type,
+                            room_busy, teacher_busy, program_busy):
     """Add a session to the schedule and update usage tracking"""
-    
-    week_key = f'week_{week+1}'
-    day_key = DAYS[day_idx]
-    time_key = TIMESLOTS[time_idx]
-    
-    session_info = {
-        'course': course_code,
-        'course_name': course_name,
-        'type': session_type,
-        'room': room,
-        'teacher': teacher,
-        'program': program
-    }
-    
-    schedule['schedule'][week_key][day_key][time_key].append(session_info)
-    
-    # Update tracking
-    room_usage[(week, day_idx, time_idx, room)] = True
-    if teacher:
-        teacher_usage[(week, day_idx, time_idx)] = teacher
-    if program:
-        program_usage[(program, week, day_idx, time_idx)] = True
 
+    slot_id = week * SLOTS_PER_WEEK + day_idx * len(TIMESLOTS) + time_idx
+
+    # Course/teacher/program fields are fixed per course, so only the
+    # per-placement type and room get added to the shared template
+    sessions_by_slot[slot_id].append({**base_info, 'type': session_type, 'room': room})
+
+    # Update tracking bitsets
+    slot_bit = 1 << slot_id
+    room_busy[room] |= slot_bit
+    if base_info['teacher']:
+        teacher_busy[base_info['teacher']] |= slot_bit
+    if base_info['program']:
+        program_busy[base_info['program']] |= slot_bit
+
+
+def to_nested(sessions_by_slot):
+    """Rebuild the nested week/day/timeslot structure from the flat
+    slot-indexed session lists, for the JSON API response"""
+    nested = {}
+    for week in range(WEEKS):
+        nested[WEEK_KEYS[week]] = {day: {timeslot: [] for timeslot in TIMESLOTS}
+                                   for day in DAYS}
 
-def solve_hard_constraints_cpsat_OLD(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    for slot_id, sessions in enumerate(sessions_by_slot):
+        if not sessions:
+            continue
+        week, offset = divmod(slot_id, SLOTS_PER_WEEK)
+        day_idx, time_idx = divmod(offset, len(TIMESLOTS))
+        nested[WEEK_KEYS[week]][DAYS[day_idx]][TIMESLOTS[time_idx]] = sessions
+
+    return nested
+
+
+def solve_hard_constraints_cpsat_OLD(input_data: Dict[str, Any],
+                                     greedy_schedule: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Phase 1: Use CP-SAT to satisfy all hard constraints
+
+    Assignment formulation: each session gets a slot IntVar in
+    [0, NUM_SLOTS) and a room IntVar, instead of one BoolVar per
+    (course, session, week, day, time, room) tuple.
+
+    greedy_schedule: an already-computed greedy result to warm-start
+    from; when omitted, the greedy solver is run here.
     """
     model = cp_model.CpModel()
-    
+
     courses = input_data['courses']
     teachers = input_data['teachers']
     programs = input_data['programs']
-    
+
     # Create mapping of courses to programs
-    course_to_programs = {}
+    course_to_programs = defaultdict(list)
     for program_name, program_data in programs.items():
         for course_code in program_data['courses']:
-            if course_code not in course_to_programs:
-                course_to_programs[course_code] = []
             course_to_programs[course_code].append(program_name)
-    
-    # Variables: session[course, session_type, week, day, timeslot, room]
-    sessions = {}
-    
-    for course in courses:
-        course_code = course['code']
-        
-        # Create variables for lectures
-        for lec in range(course.get('lectures', 0)):
-            for week in range(WEEKS):
-                for day_idx, day in enumerate(DAYS):
-                    for time_idx, timeslot in enumerate(TIMESLOTS):
-                        for room in ROOMS.keys():
-                            var = model.NewBoolVar(f'{course_code}_L{lec}_w{week}_d{day_idx}_t{time_idx}_{room}')
-                            sessions[(course_code, 'lecture', lec, week, day_idx, time_idx, room)] = var
-        
-        # Create variables for tutorials
-        for tut in range(course.get('tutorials', 0)):
-            for week in range(WEEKS):
-                for day_idx, day in enumerate(DAYS):
-                    for time_idx, timeslot in enumerate(TIMESLOTS):
-                        for room in ROOMS.keys():
-                            var = model.NewBoolVar(f'{course_code}_T{tut}_w{week}_d{day_idx}_t{time_idx}_{room}')
-                            sessions[(course_code, 'tutorial', tut, week, day_idx, time_idx, room)] = var
-        
-        # Create variables for labs
-        for lab in range(course.get('labs', 0)):
-            for week in range(WEEKS):
-                for day_idx, day in enumerate(DAYS):
-                    for time_idx, timeslot in enumerate(TIMESLOTS):
-                        for room in ROOMS.keys():
-                            var = model.NewBoolVar(f'{course_code}_Lab{lab}_w{week}_d{day_idx}_t{time_idx}_{room}')
-                            sessions[(course_code, 'lab', lab, week, day_idx, time_idx, room)] = var
-    
-    # Constraint 1: Each session must be scheduled exactly once
-    for course in courses:
-        course_code = course['code']
-        
-        for lec in range(course.get('lectures', 0)):
-            model.AddExactlyOne([
-                sessions[(course_code, 'lecture', lec, week, day, time, room)]
-                for week in range(WEEKS)
-                for day in range(len(DAYS))
-                for time in range(len(TIMESLOTS))
-                for room in ROOMS.keys()
-            ])
-        
-        for tut in range(course.get('tutorials', 0)):
-            model.AddExactlyOne([
-                sessions[(course_code, 'tutorial', tut, week, day, time, room)]
-                for week in range(WEEKS)
-                for day in range(len(DAYS))
-                for time in range(len(TIMESLOTS))
-                for room in ROOMS.keys()
-            ])
-        
-        for lab in range(course.get('labs', 0)):
-            model.AddExactlyOne([
-                sessions[(course_code, 'lab', lab, week, day, time, room)]
-                for week in range(WEEKS)
-                for day in range(len(DAYS))
-                for time in range(len(TIMESLOTS))
-                for room in ROOMS.keys()
-            ])
-    
-    # Constraint 2: No room conflicts (one session per room per timeslot)
-    for week in range(WEEKS):
-        for day in range(len(DAYS)):
-            for time in range(len(TIMESLOTS)):
-                for room in ROOMS.keys():
-                    room_sessions = []
-                    for key, var in sessions.items():
-                        if key[3] == week and key[4] == day and key[5] == time and key[6] == room:
-                            room_sessions.append(var)
-                    if room_sessions:
-                        model.AddAtMostOne(room_sessions)
-    
-    # Constraint 3: Year 1 lectures must be in MSP (capacity 150+)
+
+    # Course -> teacher (first match), same resolution rule as the
+    # greedy solver uses
+    course_to_teacher = {}
+    for t_name, t_data in teachers.items():
+        for course_code in t_data['courses']:
+            if course_code not in course_to_teacher:
+                course_to_teacher[course_code] = t_name
+
+    # Variables: one (slot, room) assignment per session, plus a
+    # channelled combo = slot * len(ROOMS) + room for room conflicts.
+    # Group slot vars by program, teacher and course/type while creating
+    # them, so the constraint blocks below never rescan the session list
+    sessions = []
+    slots_by_program = defaultdict(list)
+    slots_by_teacher = defaultdict(list)
+    lecture_slots_by_course = defaultdict(list)
+    practical_slots_by_course = defaultdict(list)
+
+    msp_idx = ROOM_NAMES.index('MSP')
+
     for course in courses:
         course_code = course['code']
-        programs_for_course = course_to_programs.get(course_code, [])
-        
-        for program_name in programs_for_course:
-            if program_name.endswith('_Y1') and programs[program_name]['size'] >= 150:
-                # Force lectures to MSP
-                for lec in range(course.get('lectures', 0)):
-                    for week in range(WEEKS):
-                        for day in range(len(DAYS)):
-                            for time in range(len(TIMESLOTS)):
-                                for room in ROOMS.keys():
-                                    if room != 'MSP':
-                                        # Force non-MSP rooms to 0
-                                        key = (course_code, 'lecture', lec, week, day, time, room)
-                                        if key in sessions:
-                                            model.Add(sessions[key] == 0)
-    
-    # Constraint 4: Students in same program can't have conflicts
-    for program_name, program_data in programs.items():
-        program_courses = program_data['courses']
-        
-        for week in range(WEEKS):
-            for day in range(len(DAYS)):
-                for time in range(len(TIMESLOTS)):
-                    # Collect all sessions for this program at this time
-                    program_sessions = []
-                    for course in courses:
-                        if course['code'] in program_courses:
-                            for key, var in sessions.items():
-                                if key[0] == course['code'] and key[3] == week and key[4] == day and key[5] == time:
-                                    program_sessions.append(var)
-                    
-                    if program_sessions:
-                        model.AddAtMostOne(program_sessions)
-    
+
+        # Prune a priori infeasible rooms instead of forbidding them with
+        # constraints later: large Y1 lectures only get MSP, practicals
+        # only get rooms that fit a group
+        program_names = course_to_programs.get(course_code, [])
+        is_large_y1 = any(p.endswith('_Y1') and programs[p]['size'] >= 150
+                          for p in program_names)
+        program_size = max((programs[p]['size'] for p in program_names), default=0)
+        group_size = program_size // 4 if program_size > 75 else program_size
+        num_groups = 4 if program_size > 75 else 1
+
+        lecture_rooms = [msp_idx] if is_large_y1 else list(range(len(ROOM_NAMES)))
+        practical_rooms = [i for i, room_name in enumerate(ROOM_NAMES)
+                           if ROOMS[room_name]['capacity'] >= group_size]
+        if not practical_rooms:
+            practical_rooms = list(range(len(ROOM_NAMES)))
+
+        teacher = course_to_teacher.get(course_code)
+
+        # Split programs get one session copy per practical group, the
+        # same expansion the greedy solver performs
+        for session_type, count in (('lecture', course.get('lectures', 0)),
+                                    ('tutorial', course.get('tutorials', 0) * num_groups),
+                                    ('lab', course.get('labs', 0) * num_groups)):
+            allowed_rooms = lecture_rooms if session_type == 'lecture' else practical_rooms
+
+            # Variable identity lives in the session dicts below, not in
+            # name strings that would have to be parsed back out later,
+            # so the solver-side names can stay empty
+            for num in range(count):
+                slot_var = model.NewIntVar(0, NUM_SLOTS - 1, '')
+                room_var = model.NewIntVarFromDomain(
+                    cp_model.Domain.FromValues(allowed_rooms), '')
+                combo_var = model.NewIntVar(0, NUM_SLOTS * len(ROOMS) - 1, '')
+                model.Add(combo_var == slot_var * len(ROOMS) + room_var)
+
+                sessions.append({
+                    'course': course_code,
+                    'type': session_type,
+                    'num': num,
+                    'slot': slot_var,
+                    'room': room_var,
+                    'combo': combo_var,
+                })
+
+                for program_name in course_to_programs.get(course_code, []):
+                    slots_by_program[program_name].append(slot_var)
+                if teacher:
+                    slots_by_teacher[teacher].append(slot_var)
+                if session_type == 'lecture':
+                    lecture_slots_by_course[course_code].append(slot_var)
+                else:
+                    practical_slots_by_course[course_code].append(slot_var)
+
+    # Constraint 1: each session is scheduled exactly once — implicit,
+    # every session has exactly one (slot, room) assignment
+
+    # Constraint 2: no room conflicts (distinct (slot, room) pairs)
+    model.AddAllDifferent([session['combo'] for session in sessions])
+
+    # Constraint 3: Year 1 lectures must be in MSP (capacity 150+) —
+    # enforced by the pruned room domains above
+
+    # Constraint 4: students in same program can't have conflicts.
+    # A single-session bucket can't conflict with itself, so skip the
+    # constraint rather than hand the solver a trivial one
+    for slot_vars in slots_by_program.values():
+        if len(slot_vars) > 1:
+            model.AddAllDifferent(slot_vars)
+
+    # Constraint 4b: a teacher covers one session per slot, regardless
+    # of room — at most one of their sessions in any slot
+    for slot_vars in slots_by_teacher.values():
+        if len(slot_vars) > 1:
+            model.AddAllDifferent(slot_vars)
+
     # Constraint 5: Minimum 2 sessions per day per student (if any sessions that day)
     # This is a soft constraint, we'll handle it in GA phase
-    
+
     # Constraint 6: Theory before practical (lectures before labs/tutorials)
     for course in courses:
         if course.get('theory_before_practical', False):
             course_code = course['code']
-            lectures = course.get('lectures', 0)
-            labs = course.get('labs', 0)
-            tutorials = course.get('tutorials', 0)
-            
-            if lectures > 0 and (labs > 0 or tutorials > 0):
-                # Find when lecture happens
-                lecture_time_var = model.NewIntVar(0, WEEKS * len(DAYS) * len(TIMESLOTS), f'{course_code}_lecture_time')
-                
-                lecture_constraints = []
-                for lec in range(lectures):
-                    for week in range(WEEKS):
-                        for day in range(len(DAYS)):
-                            for time in range(len(TIMESLOTS)):
-                                for room in ROOMS.keys():
-                                    key = (course_code, 'lecture', lec, week, day, time, room)
-                                    if key in sessions:
-                                        abs_time = week * len(DAYS) * len(TIMESLOTS) + day * len(TIMESLOTS) + time
-                                        # If this session is scheduled, lecture_time_var should be <= abs_time
-                                        model.Add(lecture_time_var <= abs_time).OnlyEnforceIf(sessions[key])
-                
-                # All labs and tutorials must be after lectures
-                for lab in range(labs):
-                    for week in range(WEEKS):
-                        for day in range(len(DAYS)):
-                            for time in range(len(TIMESLOTS)):
-                                for room in ROOMS.keys():
-                                    key = (course_code, 'lab', lab, week, day, time, room)
-                                    if key in sessions:
-                                        abs_time = week * len(DAYS) * len(TIMESLOTS) + day * len(TIMESLOTS) + time
-                                        model.Add(abs_time > lecture_time_var).OnlyEnforceIf(sessions[key])
-                
-                for tut in range(tutorials):
-                    for week in range(WEEKS):
-                        for day in range(len(DAYS)):
-                            for time in range(len(TIMESLOTS)):
-                                for room in ROOMS.keys():
-                                    key = (course_code, 'tutorial', tut, week, day, time, room)
-                                    if key in sessions:
-                                        abs_time = week * len(DAYS) * len(TIMESLOTS) + day * len(TIMESLOTS) + time
-                                        model.Add(abs_time > lecture_time_var).OnlyEnforceIf(sessions[key])
-    
-    # Solve
+            lecture_slots = lecture_slots_by_course[course_code]
+            practical_slots = practical_slots_by_course[course_code]
+            if not lecture_slots or not practical_slots:
+                continue
+
+            # Channel the extremes into two IntVars and post one
+            # inequality, instead of a constraint per (lecture,
+            # practical) pair
+            last_lecture = model.NewIntVar(0, NUM_SLOTS - 1, '')
+            first_practical = model.NewIntVar(0, NUM_SLOTS - 1, '')
+            model.AddMaxEquality(last_lecture, lecture_slots)
+            model.AddMinEquality(first_practical, practical_slots)
+            model.Add(last_lecture < first_practical)
+
+    # Warm start: seed the search with the greedy solver's placements,
+    # so CP-SAT begins from a near-feasible assignment instead of cold.
+    # Hints are advisory; sessions the greedy pass could not place (or
+    # its extra practical group copies) are simply left unhinted
+    greedy = greedy_schedule if greedy_schedule is not None else solve_with_greedy_approach(input_data)
+    if greedy:
+        placements = defaultdict(list)
+        for week_key, week_data in greedy['schedule'].items():
+            week = int(week_key.replace('week_', '')) - 1
+            for day_idx, day in enumerate(DAYS):
+                for time_idx, timeslot in enumerate(TIMESLOTS):
+                    slot_id = (week * len(DAYS) + day_idx) * len(TIMESLOTS) + time_idx
+                    for placed in week_data[day][timeslot]:
+                        placements[(placed['course'], placed['type'])].append(
+                            (slot_id, ROOM_NAMES.index(placed['room'])))
+        for session in sessions:
+            queue = placements.get((session['course'], session['type']))
+            if queue:
+                slot_id, room_idx = queue.pop()
+                model.AddHint(session['slot'], slot_id)
+                model.AddHint(session['room'], room_idx)
+
+    # Packing sessions toward early slots gives the search a direction:
+    # interchangeable sessions stop being explored as equivalent
+    # permutations, and the first feasible solutions land sooner
+    model.Minimize(sum(session['slot'] for session in sessions))
+
+    # Solve with CP-SAT's parallel portfolio: one worker per core, all
+    # sharing bounds, which parallelizes the search without having to
+    # partition the model ourselves
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = 120.0  # 2 minute timeout
+    solver.parameters.num_search_workers = os.cpu_count() or 1
     status = solver.Solve(model)
-    
+
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
         # Extract solution
         schedule = build_schedule_from_solution(solver, sessions, input_data)
@@ -438,7 +591,7 @@ def solve_hard_constraints_cpsat_OLD(input_data: Dict[str, Any]) -> Dict[str, An
 
 
 def build_schedule_from_solution(solver, sessions, input_data):
-    """Convert CP-SAT solution to schedule dictionary"""
+    """Convert CP-SAT (slot, room) assignments to schedule dictionary"""
     schedule = {
         'metadata': input_data.get('metadata', {}),
         'programs': input_data['programs'],
@@ -446,226 +599,253 @@ def build_schedule_from_solution(solver, sessions, input_data):
     }
     
     # Initialize schedule structure
-    for week in range(WEEKS):
-        schedule['schedule'][f'week_{week+1}'] = {}
+    for week_key in WEEK_KEYS:
+        schedule['schedule'][week_key] = {}
         for day in DAYS:
-            schedule['schedule'][f'week_{week+1}'][day] = {}
+            schedule['schedule'][week_key][day] = {}
             for timeslot in TIMESLOTS:
-                schedule['schedule'][f'week_{week+1}'][day][timeslot] = []
-    
-    # Extract scheduled sessions
-    for key, var in sessions.items():
-        if solver.Value(var) == 1:
-            course_code, session_type, session_num, week, day_idx, time_idx, room = key
-            
-            # Find course details
-            course_name = None
-            for course in input_data['courses']:
-                if course['code'] == course_code:
-                    course_name = course['name']
-                    break
-            
-            # Find teacher
-            teacher = None
-            for t_name, t_data in input_data['teachers'].items():
-                if course_code in t_data['courses']:
-                    teacher = t_name
-                    break
-            
-            # Find program
-            program = None
-            for prog_name, prog_data in input_data['programs'].items():
-                if course_code in prog_data['courses']:
-                    program = prog_name
-                    break
-            
-            session_info = {
-                'course': course_code,
-                'course_name': course_name,
-                'type': session_type,
-                'room': room,
-                'teacher': teacher,
-                'program': program
-            }
-            
-            week_key = f'week_{week+1}'
-            day_key = DAYS[day_idx]
-            time_key = TIMESLOTS[time_idx]
-            
-            schedule['schedule'][week_key][day_key][time_key].append(session_info)
-    
+                schedule['schedule'][week_key][day][timeslot] = []
+    
+    # Lookup tables built once, instead of scanning courses, teachers
+    # and programs again for every scheduled session
+    name_by_code = {course['code']: course['name'] for course in input_data['courses']}
+    teacher_by_code = {}
+    for t_name, t_data in input_data['teachers'].items():
+        for course_code in t_data['courses']:
+            if course_code not in teacher_by_code:
+                teacher_by_code[course_code] = t_name
+    program_by_code = {}
+    for prog_name, prog_data in input_data['programs'].items():
+        for course_code in prog_data['courses']:
+            if course_code not in program_by_code:
+                program_by_code[course_code] = prog_name
+
+    # Extract scheduled sessions; bind the value accessor once instead
+    # of dispatching through the solver object per variable
+    value = solver.Value
+    for session in sessions:
+        course_code = session['course']
+        slot_id = value(session['slot'])
+        room = ROOM_NAMES[value(session['room'])]
+        week, offset = divmod(slot_id, SLOTS_PER_WEEK)
+        day_idx, time_idx = divmod(offset, len(TIMESLOTS))
+
+        course_name = name_by_code.get(course_code)
+        teacher = teacher_by_code.get(course_code)
+        program = program_by_code.get(course_code)
+
+        session_info = {
+            'course': course_code,
+            'course_name': course_name,
+            'type': session['type'],
+            'room': room,
+            'teacher': teacher,
+            'program': program
+        }
+
+        week_key = WEEK_KEYS[week]
+        day_key = DAYS[day_idx]
+        time_key = TIMESLOTS[time_idx]
+
+        schedule['schedule'][week_key][day_key][time_key].append(session_info)
+
     return schedule
 
 
+def flatten_schedule(schedule, input_data):
+    """One pass over the nested schedule: per-program slot counts
+    plus a flat session list for the room-based metrics"""
+    counts = {program: [[0] * len(TIMESLOTS) for _ in range(WEEKS * len(DAYS))]
+              for program in input_data['programs']}
+    flat_sessions = []
+
+    for week_key, week_data in schedule['schedule'].items():
+        week = int(week_key.replace('week_', '')) - 1
+        for day_idx, day in enumerate(DAYS):
+            day_row = week * len(DAYS) + day_idx
+            for time_idx, timeslot in enumerate(TIMESLOTS):
+                for session in week_data[day][timeslot]:
+                    flat_sessions.append(session)
+                    program = session.get('program')
+                    if program in counts:
+                        counts[program][day_row][time_idx] += 1
+
+    return counts, flat_sessions
+
+
+def evaluate_fitness(schedule, input_data):
+    """Calculate fitness score (higher is better)"""
+    counts, flat_sessions = flatten_schedule(schedule, input_data)
+    program_sizes = {program: program_data['size']
+                     for program, program_data in input_data['programs'].items()}
+    score = 0
+
+    # Soft constraint 1: Even distribution across the week
+    score -= check_uneven_distribution(counts) * 10
+
+    # Soft constraint 2: Max 3 lectures per day
+    score -= count_excessive_daily_lectures(counts) * 15
+
+    # Soft constraint 3: Minimize gaps between classes
+    score -= count_student_gaps(counts) * 5
+
+    # Soft constraint 4: Same course in same room
+    score -= count_room_changes(flat_sessions) * 8
+
+    # Soft constraint 5: Room utilization above 50%
+    score -= count_underutilized_rooms(flat_sessions, program_sizes) * 3
+
+    # Soft constraint 6: Continuous classes (no gaps)
+    score += count_continuous_blocks(counts) * 2
+
+    return score
+
+
+def check_uneven_distribution(counts):
+    """Penalty for uneven distribution of lectures across week"""
+    penalty = 0
+    for program_counts in counts.values():
+        for week in range(WEEKS):
+            rows = program_counts[week * len(DAYS):(week + 1) * len(DAYS)]
+            daily_counts = [sum(row) for row in rows]
+
+            # Calculate standard deviation
+            if sum(daily_counts) > 0:
+                mean = sum(daily_counts) / len(daily_counts)
+                variance = sum((x - mean) ** 2 for x in daily_counts) / len(daily_counts)
+                penalty += variance ** 0.5
+
+    return penalty
+
+
+def count_excessive_daily_lectures(counts):
+    """Count days with more than 3 lectures"""
+    violations = 0
+    for program_counts in counts.values():
+        for row in program_counts:
+            count = sum(row)
+            if count > 3:
+                violations += (count - 3)
+
+    return violations
+
+
+def count_student_gaps(counts):
+    """Count gaps in student schedules"""
+    gaps = 0
+    for program_counts in counts.values():
+        for row in program_counts:
+            timeslots_with_class = [time_idx for time_idx, count in enumerate(row) if count]
+
+            # Count gaps
+            if len(timeslots_with_class) > 1:
+                gaps += (timeslots_with_class[-1] - timeslots_with_class[0]
+                         - len(timeslots_with_class) + 1)
+
+    return gaps
+
+
+def count_room_changes(flat_sessions):
+    """Count when same course is in different rooms"""
+    violations = 0
+    course_rooms = {}
+
+    for session in flat_sessions:
+        course = session['course']
+        if course not in course_rooms:
+            course_rooms[course] = set()
+        course_rooms[course].add(session['room'])
+
+    for course, rooms in course_rooms.items():
+        if len(rooms) > 1:
+            violations += (len(rooms) - 1)
+
+    return violations
+
+
+def count_underutilized_rooms(flat_sessions, program_sizes):
+    """Count rooms with less than 50% capacity usage"""
+    violations = 0
+
+    for session in flat_sessions:
+        room_capacity = ROOM_CAPACITY[session['room']]
+
+        # Find program size
+        program = session.get('program')
+        if program:
+            program_size = program_sizes[program]
+
+            # For tutorials/labs, assume split into groups
+            if session['type'] in ['tutorial', 'lab']:
+                program_size = program_size // 4  # Assume 4 groups
+
+            if program_size < room_capacity * 0.5:
+                violations += 1
+
+    return violations
+
+
+def count_continuous_blocks(counts):
+    """Reward continuous blocks of classes"""
+    blocks = 0
+
+    for program_counts in counts.values():
+        for row in program_counts:
+            continuous = 0
+            for count in row:
+                if count:
+                    continuous += 1
+                else:
+                    if continuous >= 2:
+                        blocks += continuous
+                    continuous = 0
+
+            if continuous >= 2:
+                blocks += continuous
+
+    return blocks
+
+
+# Per-process cache used by the fitness worker pool
+_worker_input_data = None
+
+
+def _init_fitness_worker(input_data):
+    """Cache input_data once per worker process instead of re-pickling
+    it with every candidate schedule"""
+    global _worker_input_data
+    _worker_input_data = input_data
+    _rng.seed(os.getpid())
+
+
+def _fitness_worker(schedule):
+    return evaluate_fitness(schedule, _worker_input_data)
+
+
+def evaluate_population(population, input_data, max_workers=None):
+    """Score a population of candidate schedules, in parallel across
+    processes when there is more than one candidate"""
+    if len(population) <= 1:
+        return [evaluate_fitness(schedule, input_data) for schedule in population]
+
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_fitness_worker,
+                             initargs=(input_data,)) as pool:
+        return list(pool.map(_fitness_worker, population))
+
+
 def optimize_soft_constraints_ga_OLD(initial_schedule: Dict[str, Any], input_data: Dict[str, Any], 
                                   population_size: int = 50, generations: int = 100) -> Dict[str, Any]:
     """
     Phase 2: Use Genetic Algorithm to optimize soft constraints
     """
     
-    def evaluate_fitness(schedule):
-        """Calculate fitness score (higher is better)"""
-        score = 0
-        
-        # Soft constraint 1: Even distribution across the week
-        score -= check_uneven_distribution(schedule) * 10
-        
-        # Soft constraint 2: Max 3 lectures per day
-        score -= count_excessive_daily_lectures(schedule) * 15
-        
-        # Soft constraint 3: Minimize gaps between classes
-        score -= count_student_gaps(schedule) * 5
-        
-        # Soft constraint 4: Same course in same room
-        score -= count_room_changes(schedule) * 8
-        
-        # Soft constraint 5: Room utilization above 50%
-        score -= count_underutilized_rooms(schedule) * 3
-        
-        # Soft constraint 6: Continuous classes (no gaps)
-        score += count_continuous_blocks(schedule) * 2
-        
-        return score
-    
-    def check_uneven_distribution(schedule):
-        """Penalty for uneven distribution of lectures across week"""
-        penalty = 0
-        for program_name in input_data['programs'].keys():
-            for week_key, week_data in schedule['schedule'].items():
-                daily_counts = [0] * 5
-                for day_idx, day in enumerate(DAYS):
-                    for timeslot, sessions in week_data[day].items():
-                        for session in sessions:
-                            if session.get('program') == program_name:
-                                daily_counts[day_idx] += 1
-                
-                # Calculate standard deviation
-                if sum(daily_counts) > 0:
-                    mean = sum(daily_counts) / len(daily_counts)
-                    variance = sum((x - mean) ** 2 for x in daily_counts) / len(daily_counts)
-                    penalty += variance ** 0.5
-        
-        return penalty
-    
-    def count_excessive_daily_lectures(schedule):
-        """Count days with more than 3 lectures"""
-        violations = 0
-        for program_name in input_data['programs'].keys():
-            for week_key, week_data in schedule['schedule'].items():
-                for day in DAYS:
-                    count = 0
-                    for timeslot, sessions in week_data[day].items():
-                        for session in sessions:
-                            if session.get('program') == program_name:
-                                count += 1
-                    if count > 3:
-                        violations += (count - 3)
-        
-        return violations
-    
-    def count_student_gaps(schedule):
-        """Count gaps in student schedules"""
-        gaps = 0
-        for program_name in input_data['programs'].keys():
-            for week_key, week_data in schedule['schedule'].items():
-                for day in DAYS:
-                    timeslots_with_class = []
-                    for time_idx, timeslot in enumerate(TIMESLOTS):
-                        has_class = False
-                        for session in week_data[day][timeslot]:
-                            if session.get('program') == program_name:
-                                has_class = True
-                                break
-                        if has_class:
-                            timeslots_with_class.append(time_idx)
-                    
-                    # Count gaps
-                    if len(timeslots_with_class) > 1:
-                        for i in range(len(timeslots_with_class) - 1):
-                            gap = timeslots_with_class[i+1] - timeslots_with_class[i] - 1
-                            gaps += gap
-        
-        return gaps
-    
-    def count_room_changes(schedule):
-        """Count when same course is in different rooms"""
-        violations = 0
-        course_rooms = {}
-        
-        for week_key, week_data in schedule['schedule'].items():
-            for day in DAYS:
-                for timeslot, sessions in week_data[day].items():
-                    for session in sessions:
-                        course = session['course']
-                        room = session['room']
-                        
-                        if course not in course_rooms:
-                            course_rooms[course] = set()
-                        course_rooms[course].add(room)
-        
-        for course, rooms in course_rooms.items():
-            if len(rooms) > 1:
-                violations += (len(rooms) - 1)
-        
-        return violations
-    
-    def count_underutilized_rooms(schedule):
-        """Count rooms with less than 50% capacity usage"""
-        violations = 0
-        
-        for week_key, week_data in schedule['schedule'].items():
-            for day in DAYS:
-                for timeslot, sessions in week_data[day].items():
-                    for session in sessions:
-                        room = session['room']
-                        room_capacity = ROOMS[room]['capacity']
-                        
-                        # Find program size
-                        program = session.get('program')
-                        if program:
-                            program_size = input_data['programs'][program]['size']
-                            
-                            # For tutorials/labs, assume split into groups
-                            if session['type'] in ['tutorial', 'lab']:
-                                program_size = program_size // 4  # Assume 4 groups
-                            
-                            if program_size < room_capacity * 0.5:
-                                violations += 1
-        
-        return violations
-    
-    def count_continuous_blocks(schedule):
-        """Reward continuous blocks of classes"""
-        blocks = 0
-        
-        for program_name in input_data['programs'].keys():
-            for week_key, week_data in schedule['schedule'].items():
-                for day in DAYS:
-                    continuous = 0
-                    for time_idx, timeslot in enumerate(TIMESLOTS):
-                        has_class = False
-                        for session in week_data[day][timeslot]:
-                            if session.get('program') == program_name:
-                                has_class = True
-                                break
-                        
-                        if has_class:
-                            continuous += 1
-                        else:
-                            if continuous >= 2:
-                                blocks += continuous
-                            continuous = 0
-                    
-                    if continuous >= 2:
-                        blocks += continuous
-        
-        return blocks
-    
+
     # For hackathon MVP, we'll do a simple local search instead of full GA
     # due to complexity of preserving hard constraints during crossover
     
     best_schedule = initial_schedule
-    best_score = evaluate_fitness(initial_schedule)
+    best_score = evaluate_fitness(initial_schedule, input_data)
     
     print(f"Initial fitness: {best_score}")
     